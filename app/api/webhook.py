@@ -1,4 +1,5 @@
 import traceback
+from operator import itemgetter
 from typing import Dict, Any
 
 from fastapi import Response
@@ -9,6 +10,9 @@ from app.logging import setup_logger, log_exception
 logger = setup_logger(__name__)
 workflow_manager = WorkflowManager()
 
+# WhatsApp always sends both fields on a message; fetch them in one call
+_sender_and_type = itemgetter("from", "type")
+
 
 async def verify_webhook(
     hub_mode: str, hub_verify_token: str, hub_challenge: str
@@ -17,7 +21,7 @@ async def verify_webhook(
     Verify webhook request from WhatsApp API
     """
     if hub_verify_token == settings.WHATSAPP_VERIFY_TOKEN:
-        logger.info(f"Verified webhook with mode: {hub_mode}")
+        logger.info("Verified webhook with mode: %s", hub_mode)
         return Response(content=hub_challenge, media_type="text/plain")
 
     logger.error("Webhook verification failed")
@@ -59,7 +63,7 @@ async def handle_message(data: Dict[Any, Any]) -> Dict[str, Any]:
             is_media_message=is_media_message,
         )
 
-        logger.info(f"Successfully processed message from {sender_id}")
+        logger.info("Successfully processed message from %s", sender_id)
         return {"status": "success", "message": "Message processed"}
 
     except Exception as e:
@@ -81,20 +85,10 @@ def extract_message_data(data: Dict[Any, Any]) -> Dict[str, Any]:
     Returns None for non-message events
     """
     try:
-        # Navigate through the webhook data structure
-        entries = data.get("entry", [])
-        if not entries:
-            logger.error("No entries in webhook data")
-            return None
-
-        entry = entries[0]
-        changes = entry.get("changes", [])
-        if not changes:
-            logger.error("No changes in webhook entry")
-            return None
-
-        value = changes[0].get("value", {})
-        if not value or value.get("messaging_product") != "whatsapp":
+        # Unwrap entry/changes/value; the payload comes back unchanged if
+        # it has no change value
+        value = workflow_manager.whatsapp.preprocess(data)
+        if value is data or value.get("messaging_product") != "whatsapp":
             logger.error(f"Invalid message format: {value}")
             return None
 
@@ -104,8 +98,11 @@ def extract_message_data(data: Dict[Any, Any]) -> Dict[str, Any]:
 
         # Extract message details
         message = messages[0]
-        sender_id = message.get("from")
-        message_type = message.get("type", "unknown")
+        try:
+            sender_id, message_type = _sender_and_type(message)
+        except KeyError:
+            logger.error(f"Message without sender or type: {message}")
+            return None
 
         # Handle different message types
         if message_type == "interactive":
@@ -115,7 +112,7 @@ def extract_message_data(data: Dict[Any, Any]) -> Dict[str, Any]:
         elif message_type == "text":
             message_text = message.get("text", {}).get("body", "")
         else:
-            logger.info(f"Unprocessed message type: {message_type}")
+            logger.info("Unprocessed message type: %s", message_type)
             return None
 
         # Create a structured response with all necessary information
@@ -160,7 +157,7 @@ def handle_media_message(
         logger.error(f"Missing media ID for {message_type} message")
         return ""
 
-    logger.info(f"Received {message_type} with ID: {media_id}, mime: {media_mime}")
+    logger.info("Received %s with ID: %s, mime: %s", message_type, media_id, media_mime)
 
     # Store media metadata in user context
     context = workflow_manager.state_manager.get_context(sender_id)
@@ -56,6 +56,16 @@ class Settings(BaseSettings):
     WHATSAPP_PHONE_NUMBER_ID: str = Field(..., env="WHATSAPP_PHONE_NUMBER_ID")
     WHATSAPP_VERIFY_TOKEN: str = Field(..., env="WHATSAPP_VERIFY_TOKEN")
 
+    # Workflow
+    # Conversations whose state is kept in memory; the least recently active
+    # beyond this are forgotten and restart from the beginning
+    MAX_TRACKED_CLIENTS: int = Field(default=100_000, env="MAX_TRACKED_CLIENTS")
+    # Messages a client may have waiting to be handled; further messages from
+    # that client are dropped until the backlog drains
+    MAX_CLIENT_QUEUE_SIZE: int = Field(default=20, env="MAX_CLIENT_QUEUE_SIZE")
+    # Messages handled at once across all clients
+    MAX_CONCURRENT_HANDLERS: int = Field(default=50, env="MAX_CONCURRENT_HANDLERS")
+
     # Admin
     ADMIN_WHATSAPP_NUMBER: str = Field(..., env="ADMIN_WHATSAPP_NUMBER")
     ADMIN_PASSWORD: str = Field(..., env="ADMIN_PASSWORD")
@@ -1,7 +1,10 @@
+import atexit
 import logging
+import queue
 import sys
 import traceback
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional, Union
 from pathlib import Path
 
@@ -26,6 +29,17 @@ COLORS = {
 }
 
 
+# Console output goes through a queue to a single background thread, so code
+# running on the event loop never blocks on the terminal's stream lock.
+# Records are fully formatted before they are queued.
+_CONSOLE_QUEUE = queue.SimpleQueue()
+_console_stream_handler = logging.StreamHandler()
+_console_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+_console_listener = QueueListener(_CONSOLE_QUEUE, _console_stream_handler)
+_console_listener.start()
+atexit.register(_console_listener.stop)
+
+
 class ColoredFormatter(logging.Formatter):
     """
     Custom formatter that adds colors to log level names in terminal output.
@@ -105,8 +119,8 @@ def setup_logger(
 
     # Only add handlers if none exist already
     if not logger.handlers:
-        # Console output with colors
-        console_handler = logging.StreamHandler()
+        # Console output with colors, written by the background listener
+        console_handler = QueueHandler(_CONSOLE_QUEUE)
         console_handler.setFormatter(colored_formatter)
         logger.addHandler(console_handler)
 
@@ -11,10 +11,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.db import Base, engine, get_db
 from app.middleware import CustomJWTAuthMiddleware
-from app.api.webhook import verify_webhook, handle_message
+from app.api.webhook import verify_webhook, handle_message, workflow_manager
 from app.api.auth.whatsapp import router as whatsapp_auth_router
 from app.api.auth.session import router as session_router
 from app.services.auth.whatsapp import AuthService
+from app.services.http import GRAPH_CLIENT
 from app.logging import setup_logger
 
 logger = setup_logger(__name__)
@@ -53,6 +54,8 @@ async def lifespan(app: FastAPI):
             pass
 
     yield
+    await workflow_manager.aclose()
+    await GRAPH_CLIENT.aclose()
     logger.info("Application shutdown")
 
 
@@ -1,3 +1,6 @@
+import asyncio
+import time
+from collections import OrderedDict
 from typing import Tuple, List, Dict, Any, Optional
 from app.logging import setup_logger
 from .openai_service import AsyncOpenAIService
@@ -7,6 +10,10 @@ from app.services.content.template_service import template_service
 from app.services.content.template_config import get_template_config
 from app.models.field_source import FieldSource
 
+# Generated content is reused for repeated promo texts for up to an hour
+CONTENT_CACHE_SIZE = 1024
+CONTENT_CACHE_TTL = 3600
+
 
 class ContentGenerator:
     """Service for generating content"""
@@ -17,30 +24,37 @@ class ContentGenerator:
         self.logger = setup_logger(__name__)
         self.default_image = "https://example.com/mock-image.jpg"
         self.default_video = "https://example.com/mock-video.mp4"
+        # promo_text -> (expiry timestamp, caption, media URLs), oldest first
+        self._content_cache: OrderedDict[str, Tuple[float, str, List[str]]] = (
+            OrderedDict()
+        )
 
     async def generate_content(self, promo_text: str) -> Tuple[str, List[str]]:
-        """Generate engaging content for a given promotional text."""
+        """
+        Generate engaging content for a given promotional text.
+
+        The caption and the media search are independent, so both run
+        concurrently; either one failing falls back to its own default.
+        Successful results are cached per promo text.
+        """
+        cached = self._content_cache.get(promo_text)
+        if cached and cached[0] > time.monotonic():
+            self._content_cache.move_to_end(promo_text)
+            return cached[1], list(cached[2])
+
         try:
-            # Generate caption
-            caption = await self._generate_with_openai(
-                OPENAI_PROMPTS["caption_system"],
-                OPENAI_PROMPTS["caption_user"],
-                promo_text=promo_text,
+            caption, image_results = await asyncio.gather(
+                self._generate_with_openai(
+                    OPENAI_PROMPTS["caption_system"],
+                    OPENAI_PROMPTS["caption_user"],
+                    promo_text=promo_text,
+                ),
+                self._search_media_for_promo(promo_text),
             )
+            if caption and image_results:
+                self._cache_content(promo_text, caption, image_results)
             if not caption:
                 caption = f"✨ {promo_text}"
-
-            # Generate search query
-            search_query = await self._generate_with_openai(
-                OPENAI_PROMPTS["search_system"],
-                OPENAI_PROMPTS["search_user"],
-                caption=caption,
-            )
-            if not search_query:
-                search_query = promo_text
-
-            # Get media URLs
-            image_results = await self._get_media_urls(search_query)
             if not image_results:
                 image_results = [self.default_image] * 4
 
@@ -203,3 +217,22 @@ class ContentGenerator:
         except Exception as e:
             self.logger.warning(f"Media search failed: {e}")
             return []
+
+    async def _search_media_for_promo(self, promo_text: str) -> List[str]:
+        """Generate a search query from the promotional text and fetch media."""
+        search_query = await self._generate_with_openai(
+            OPENAI_PROMPTS["search_system"],
+            OPENAI_PROMPTS["search_user"],
+            caption=promo_text,
+        )
+        return await self._get_media_urls(search_query or promo_text)
+
+    def _cache_content(
+        self, promo_text: str, caption: str, media_urls: List[str]
+    ) -> None:
+        """Store generated content, evicting the least recently used entry."""
+        expires_at = time.monotonic() + CONTENT_CACHE_TTL
+        self._content_cache[promo_text] = (expires_at, caption, list(media_urls))
+        self._content_cache.move_to_end(promo_text)
+        if len(self._content_cache) > CONTENT_CACHE_SIZE:
+            self._content_cache.popitem(last=False)
@@ -3,6 +3,7 @@ import httpx
 from app.logging import setup_logger
 from urllib.parse import quote
 from app.config import settings
+from app.services.http import SSL_CONTEXT
 
 MediaType = Literal["image", "video"]
 
@@ -171,69 +172,74 @@ class MediaService:
         self.pexels = PexelsProvider()
         self.pixabay = PixabayProvider()
         self.logger = setup_logger(__name__)
+        # Pooled client shared by every search so repeat queries to the same
+        # provider reuse warm connections
+        self._client = httpx.AsyncClient(verify=SSL_CONTEXT)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._client.aclose()
 
     async def search_images(self, query: str, limit: int = 10) -> List[str]:
         """
         Search for images from providers in priority order: Pexels → Unsplash → Pixabay.
         Returns the first non-empty result list.
         """
-        async with httpx.AsyncClient() as client:
-            providers = [
-                ("pexels", self.pexels.search_images),
-                ("unsplash", self.unsplash.search_images),
-                ("pixabay", self.pixabay.search_images),
-            ]
+        providers = [
+            ("pexels", self.pexels.search_images),
+            ("unsplash", self.unsplash.search_images),
+            ("pixabay", self.pixabay.search_images),
+        ]
 
-            for provider_name, search_method in providers:
-                try:
-                    result = await search_method(query, limit, client)
-                    if result:
-                        self.logger.info(
-                            f"Retrieved image results from {provider_name} successfully."
-                        )
-                        return result
-                    else:
-                        self.logger.warning(f"No image results from {provider_name}.")
-                except Exception as e:
-                    self.logger.error(
-                        f"Error retrieving image results from {provider_name}: {e}"
+        for provider_name, search_method in providers:
+            try:
+                result = await search_method(query, limit, self._client)
+                if result:
+                    self.logger.info(
+                        f"Retrieved image results from {provider_name} successfully."
                     )
+                    return result
+                else:
+                    self.logger.warning(f"No image results from {provider_name}.")
+            except Exception as e:
+                self.logger.error(
+                    f"Error retrieving image results from {provider_name}: {e}"
+                )
 
-            self.logger.warning(
-                "All providers returned no image results or errors. Returning empty list."
-            )
-            return []
+        self.logger.warning(
+            "All providers returned no image results or errors. Returning empty list."
+        )
+        return []
 
     async def search_videos(self, query: str, limit: int = 10) -> List[str]:
         """
         Search for videos from providers in priority order: Pexels → Pixabay.
         Returns the first non-empty result list.
         """
-        async with httpx.AsyncClient() as client:
-            providers = [
-                ("pexels", self.pexels.search_videos),
-                ("pixabay", self.pixabay.search_videos),
-            ]
+        providers = [
+            ("pexels", self.pexels.search_videos),
+            ("pixabay", self.pixabay.search_videos),
+        ]
 
-            for provider_name, search_method in providers:
-                try:
-                    result = await search_method(query, limit, client)
-                    if result:
-                        self.logger.info(
-                            f"Retrieved video results from {provider_name} successfully."
-                        )
-                        return result
-                    else:
-                        self.logger.warning(f"No video results from {provider_name}.")
-                except Exception as e:
-                    self.logger.error(
-                        f"Error retrieving video results from {provider_name}: {e}"
+        for provider_name, search_method in providers:
+            try:
+                result = await search_method(query, limit, self._client)
+                if result:
+                    self.logger.info(
+                        f"Retrieved video results from {provider_name} successfully."
                     )
+                    return result
+                else:
+                    self.logger.warning(f"No video results from {provider_name}.")
+            except Exception as e:
+                self.logger.error(
+                    f"Error retrieving video results from {provider_name}: {e}"
+                )
 
-            self.logger.warning(
-                "All providers returned no video results or errors. Returning empty list."
-            )
-            return []
+        self.logger.warning(
+            "All providers returned no video results or errors. Returning empty list."
+        )
+        return []
 
     async def search_media(
         self, query: str, media_type: MediaType = "image", limit: int = 10
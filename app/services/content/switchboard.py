@@ -1,7 +1,9 @@
 import httpx
+import orjson
 from typing import Dict, Any
 from app.constants import SOCIAL_MEDIA_PLATFORMS
 from app.config import settings
+from app.services.http import SSL_CONTEXT
 from app.logging import setup_logger
 
 from app.services.content.template_config import get_template_config
@@ -20,7 +22,7 @@ class SwitchboardService:
                 "X-API-Key": settings.SWITCHBOARD_API_KEY,
                 "Content-Type": "application/json",
             },
-            verify=True,
+            verify=SSL_CONTEXT,
         )
 
     def build_payload(
@@ -80,6 +82,8 @@ class SwitchboardService:
         post_type: str,
     ) -> Dict[str, Any]:
         """Helper function to create an image using Switchboard Canvas"""
+        # Bound up front so the error log works wherever the failure happens
+        payload = response = None
         try:
             for key in ["main_image", "event_image", "video_background", "logo"]:
                 val = template_data.get(key)
@@ -91,7 +95,8 @@ class SwitchboardService:
 
             self.logger.info(f"Editing image with template data: {template_data}")
             payload = self.build_payload(client_id, template_data, platform, post_type)
-            response = self.client.post(self.base_url, json=payload)
+            # Content-Type is already set on the client
+            response = self.client.post(self.base_url, content=orjson.dumps(payload))
             response.raise_for_status()
             response_json = response.json()
             self.logger.info(
@@ -100,8 +105,9 @@ class SwitchboardService:
             return response_json
 
         except Exception as e:
+            body = response.text if response is not None else None
             self.logger.error(
-                f"Error editing image | Payload: {payload} | Response: {response.text} | Error: {e}"
+                f"Error editing image | Payload: {payload} | Response: {body} | Error: {e}"
             )
             return None
 
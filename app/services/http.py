@@ -0,0 +1,34 @@
+"""
+Shared HTTP configuration for outbound API calls.
+
+Every httpx client in the application should be built from the settings in
+this module so that they share TLS state instead of each loading its own copy.
+"""
+
+import httpx
+
+from app.config import settings
+
+# Building an SSL context loads the whole CA bundle (hundreds of KB per
+# context); sharing one also shares OpenSSL's TLS session cache, so
+# reconnects to the same host can resume sessions.
+SSL_CONTEXT = httpx.create_ssl_context()
+
+# One pooled HTTP/2 client for all Graph API traffic made with the app's own
+# WhatsApp token: message sends, uploads, media lookups and media downloads.
+# Sharing it keeps every request on the same warm connections instead of
+# each service holding a pool of its own. Closed in the app lifespan.
+GRAPH_CLIENT = httpx.AsyncClient(
+    headers={"Authorization": f"Bearer {settings.WHATSAPP_TOKEN}"},
+    timeout=30.0,
+    transport=httpx.AsyncHTTPTransport(
+        verify=SSL_CONTEXT,
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=50,
+            keepalive_expiry=30,
+        ),
+    ),
+)
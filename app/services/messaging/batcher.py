@@ -0,0 +1,117 @@
+"""
+Coalescing queue for outbound messages.
+
+Sends submitted within a short window are collected and flushed together,
+concurrently, so bursts of messages from many conversations go out over the
+shared HTTP/2 connection as one wave instead of trickling out one by one.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+Payload = Dict[str, Any]
+Pending = Tuple[Payload, asyncio.Future]
+
+# Queued by aclose() to tell the worker no more payloads will follow
+_STOP = object()
+
+
+class MessageBatcher:
+    """
+    Collect payloads and send them in concurrent batches.
+
+    Args:
+        send: Coroutine function that sends one payload and returns its result
+        max_messages: Largest number of payloads flushed together
+        max_delay: Seconds to wait for more payloads after the first arrives
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Payload], Awaitable[Payload]],
+        max_messages: int = 50,
+        max_delay: float = 0.02,
+    ):
+        self._send = send
+        self.max_messages = max_messages
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self._closed = False
+
+    async def submit(self, payload: Payload) -> Payload:
+        """Queue a payload and wait for the result of sending it."""
+        if self._closed:
+            raise RuntimeError("MessageBatcher is closed")
+        if self._worker is None or self._worker.done():
+            # Started lazily since the batcher may be built outside a loop
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((payload, future))
+        return await future
+
+    async def aclose(self) -> None:
+        """
+        Stop accepting payloads, send everything already submitted and wait
+        for those sends to finish.
+        """
+        self._closed = True
+        if self._worker is not None:
+            # Queued behind every accepted payload, so the worker flushes
+            # all of them before it sees the stop marker and exits
+            self._queue.put_nowait(_STOP)
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """Gather payloads into batches and hand each batch off for sending."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+
+            while len(batch) < self.max_messages:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # Flush in the background so the next batch can start collecting
+            # while this one is still in flight
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Pending]) -> None:
+        """Send a batch concurrently and resolve each caller's future."""
+        logger.debug("Flushing batch of %s messages", len(batch))
+        results = await asyncio.gather(
+            *(self._send(payload) for payload, _ in batch), return_exceptions=True
+        )
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
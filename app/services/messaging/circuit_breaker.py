@@ -0,0 +1,68 @@
+"""
+Circuit breaker for outbound messaging API calls.
+
+When the WhatsApp Graph API is failing consistently, the breaker opens and
+sends fail fast for a cool-down period instead of paying a full round trip
+for every message. After the cool-down a single trial request is let through
+(half-open); its outcome decides whether the breaker closes or re-opens.
+"""
+
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Minimal closed -> open -> half-open circuit breaker.
+
+    Args:
+        threshold: Consecutive failures before the circuit opens
+        reset_after: Seconds to stay open before allowing a trial request
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, threshold: int = 5, reset_after: float = 30.0):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.state = self.CLOSED
+        self.fail_count = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.trial_started_at = 0.0
+
+    def allow(self) -> bool:
+        """Return True if a request may be attempted right now."""
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.reset_after:
+                return False
+            self.state = self.HALF_OPEN
+        elif self.trial_in_flight and now - self.trial_started_at < self.reset_after:
+            # Half-open with the trial still pending; a trial that never
+            # reported back (e.g. cancelled) is replaced after the cool-down
+            return False
+        self.trial_in_flight = True
+        self.trial_started_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Reset the breaker after a successful request."""
+        self.state = self.CLOSED
+        self.fail_count = 0
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit at the threshold."""
+        self.fail_count += 1
+        self.trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.fail_count >= self.threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
@@ -6,17 +6,194 @@ allowing the application to send text messages, media, and interactive elements.
 """
 
 from __future__ import annotations
+import asyncio
+import hashlib
 import httpx
-import re
-import os
-from typing import Dict, Any, Optional, Union, List
+import orjson
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Any, Iterator, Optional, Tuple, Union, List
 from app.logging import setup_logger
 from app.services.types import MediaItem, ButtonItem, SectionItem
+from app.services.messaging.batcher import MessageBatcher
+from app.services.messaging.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.messaging.rate_limiter import TokenBucket
+from app.services.http import SSL_CONTEXT
 from app.config import MEDIA_BASE_URL  # noqa: F401
 
-# Directory for temporary video storage
-TEMP_DIR = "media/temp_videos"
-os.makedirs(TEMP_DIR, exist_ok=True)
+logger = setup_logger(__name__)
+
+# Videos up to this size are buffered in memory on their way to WhatsApp;
+# larger ones spill over to an anonymous temporary file
+VIDEO_SPOOL_MAX_SIZE = 32 << 20
+
+# Read size when downloading videos; large chunks keep per-chunk loop and
+# copy overhead low for multi-megabyte files
+VIDEO_CHUNK_SIZE = 256 << 10
+
+# Upper bound on concurrent Graph API requests per sending phone number
+MAX_CONCURRENT_SENDS = 10
+
+# Sustained Graph API requests per second per sending phone number (the
+# Cloud API's default throughput), with bursts up to the same size
+MAX_SENDS_PER_SECOND = 80
+
+# Phone number ID -> semaphore and token bucket shared by every client
+# sending from it, since the Graph API rate-limits per phone number rather
+# than per client object
+_send_semaphores: Dict[str, asyncio.Semaphore] = {}
+_send_buckets: Dict[str, TokenBucket] = {}
+
+# Throttled or temporarily unavailable responses are retried with
+# exponential backoff and jitter, up to this many extra attempts
+RETRY_STATUS_CODES = frozenset({429, 503})
+MAX_SEND_RETRIES = 5
+MAX_RETRY_DELAY = 8.0
+
+# Upper bound on in-flight recipients during a broadcast, kept under
+# WhatsApp's per-number throughput limit
+MAX_BROADCAST_CONCURRENCY = 50
+
+# How long an uploaded media ID is reused; WhatsApp keeps uploads for 15 days
+MEDIA_ID_TTL = 14 * 24 * 3600
+# Uploaded media IDs remembered per client; least recently used go first
+MEDIA_ID_CACHE_SIZE = 1024
+
+# WhatsApp interactive list limits; oversized lists are rejected by the API
+MAX_LIST_ROWS = 10
+MAX_LIST_SECTIONS = 10
+MAX_LIST_BUTTON_TEXT = 20
+MAX_LIST_TITLE = 24
+MAX_LIST_DESCRIPTION = 72
+
+
+# Fixed part of every outbound message payload, per message type. Sends copy
+# one and fill in the recipient and content instead of rebuilding it.
+_PAYLOAD_SKELETONS: Dict[str, Dict[str, str]] = {
+    message_type: {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "type": message_type,
+    }
+    for message_type in ("text", "image", "video", "interactive")
+}
+
+
+# Extra header for pre-encoded JSON bodies, normalized once rather than
+# rebuilt from a dict on every request
+_JSON_HEADERS = httpx.Headers({"Content-Type": "application/json"})
+
+
+def _payload(message_type: str, recipient_type: str, **fields: Any) -> Dict[str, Any]:
+    """Copy the payload skeleton for a message type and add the given fields."""
+    payload = {**_PAYLOAD_SKELETONS[message_type], **fields}
+    if recipient_type != "individual":
+        payload["recipient_type"] = recipient_type
+    return payload
+
+
+def _parse_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body with orjson."""
+    return orjson.loads(response.content)
+
+
+class LazyJSONResponse(Mapping):
+    """
+    Read-only mapping over a successful API response, parsed on first access.
+
+    Most callers ignore what a send returns, so the body is only decoded if
+    something actually reads it.
+    """
+
+    __slots__ = ("_data", "_response")
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    def _json(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = _parse_json(self._response)
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._json()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._json())
+
+    def __len__(self) -> int:
+        return len(self._json())
+
+    def __repr__(self) -> str:
+        return repr(self._json())
+
+
+class _SpoolReader:
+    """
+    Read-only view of a spooled video for multipart uploads.
+
+    httpx sizes upload files with fileno(), which makes a SpooledTemporaryFile
+    still held in memory roll over to disk. Exposing only read/seek/tell makes
+    httpx size it by seeking, and it streams the body in chunks either way.
+    """
+
+    __slots__ = ("_file",)
+
+    def __init__(self, file: SpooledTemporaryFile):
+        self._file = file
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+
+def _list_row(item: ButtonItem) -> Dict[str, str]:
+    """Build one interactive list row, truncating text to API limits."""
+    return {
+        "id": item.id,
+        "title": item.title[:MAX_LIST_TITLE],
+        "description": item.description[:MAX_LIST_DESCRIPTION],
+    }
+
+
+def _chunk_sections(
+    sections: List[SectionItem],
+    max_rows: int = MAX_LIST_ROWS,
+    max_sections: int = MAX_LIST_SECTIONS,
+) -> Iterator[List[SectionItem]]:
+    """
+    Split sections into groups that each fit in a single interactive list.
+
+    Sections are split across groups when their rows do not fit, keeping the
+    section title on every part.
+    """
+    chunk: List[SectionItem] = []
+    rows = 0
+    for section in sections:
+        items = section.items
+        while items:
+            if rows == max_rows or len(chunk) == max_sections:
+                yield chunk
+                chunk, rows = [], 0
+            part = items[: max_rows - rows]
+            chunk.append(SectionItem(title=section.title, items=part))
+            rows += len(part)
+            items = items[len(part) :]
+    if chunk:
+        yield chunk
 
 
 class MessagingClient:
@@ -28,7 +205,7 @@ class MessagingClient:
     """
 
     def __init__(self):
-        self.logger = setup_logger(__name__)
+        self.logger = logger
 
     async def send_message(
         self, message: str, recipient_id: str, **kwargs
@@ -118,7 +295,10 @@ class WhatsApp(MessagingClient):
     """WhatsApp messaging client implementation using the WhatsApp Business API."""
 
     def __init__(
-        self, token: Optional[str] = None, phone_number_id: Optional[str] = None
+        self,
+        token: Optional[str] = None,
+        phone_number_id: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
     ):
         super().__init__()
         self.token = token
@@ -126,22 +306,151 @@ class WhatsApp(MessagingClient):
         self.base_url = "https://graph.facebook.com/v14.0"
         self.v15_base_url = "https://graph.facebook.com/v15.0"
         self.url = f"{self.base_url}/{phone_number_id}/messages"
-        self.headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.token}",
-        }
+        self.upload_url = f"{self.v15_base_url}/{phone_number_id}/media"
+        self._breaker = CircuitBreaker(threshold=5, reset_after=30.0)
+        self._send_semaphore = _send_semaphores.setdefault(
+            phone_number_id, asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        )
+        self._send_bucket = _send_buckets.setdefault(
+            phone_number_id,
+            TokenBucket(rate=MAX_SENDS_PER_SECOND, capacity=MAX_SENDS_PER_SECOND),
+        )
+        # Text messages from concurrent conversations are flushed together
+        self._batcher = MessageBatcher(self._send_payload)
+        # Source video URL -> (WhatsApp media ID, expiry timestamp), oldest first
+        self._media_id_cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        # One pooled client for the lifetime of this instance so consecutive
+        # sends reuse warm keep-alive connections instead of a new TCP+TLS
+        # handshake per call, with HTTP/2 multiplexing concurrent sends over
+        # one connection. Failed connection attempts are retried by the
+        # transport. The auth header is set once here; httpx adds the right
+        # Content-Type for each request body. A shared client may be passed
+        # in instead, as long as it already carries this token's auth
+        # header; it is then left open for its owner to close.
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {self.token}"},
+            timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(
+                verify=SSL_CONTEXT,
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=40,
+                    keepalive_expiry=30,
+                ),
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Send already queued messages and close the pooled HTTP client if owned."""
+        await self._batcher.aclose()
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "WhatsApp":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _post(
+        self, url: str, json: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> httpx.Response:
+        """
+        POST to the Graph API through the circuit breaker and rate limiter.
+
+        Server errors and transport failures count towards opening the circuit;
+        while it is open, requests fail fast with CircuitOpenError. 429 and 503
+        responses are retried with exponential backoff, honouring short
+        Retry-After values. JSON bodies are
+        serialized with orjson.
+        """
+        if json is not None:
+            kwargs["content"] = orjson.dumps(json)
+            kwargs["headers"] = _JSON_HEADERS
+
+        attempt = 0
+        while True:
+            if not self._breaker.allow():
+                raise CircuitOpenError("WhatsApp API circuit is open, request skipped")
+
+            await self._send_bucket.acquire()
+            try:
+                async with self._send_semaphore:
+                    response = await self._client.post(url, **kwargs)
+            except httpx.TransportError:
+                self._breaker.record_failure()
+                raise
+
+            if response.status_code >= 500:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
 
-    def preprocess(self, data: Dict[Any, Any]) -> Dict[Any, Any]:
-        """Preprocess webhook data before handling"""
-        if data.get("object"):
             if (
-                "entry" in data
-                and data["entry"]
-                and data["entry"][0].get("changes")
-                and data["entry"][0]["changes"][0].get("value")
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt >= MAX_SEND_RETRIES
             ):
-                return data["entry"][0]["changes"][0]["value"]
-        return data
+                return response
+
+            attempt += 1
+            delay = min(1.5**attempt, MAX_RETRY_DELAY) + random.random() * 0.2
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                # Waiting out a long server-requested pause would stall the
+                # caller; hand the throttled response back instead
+                if int(retry_after) > MAX_RETRY_DELAY:
+                    return response
+                delay = max(delay, int(retry_after))
+            self.logger.warning(
+                "Graph API returned %s, retrying in %.1fs (attempt %s/%s)",
+                response.status_code,
+                delay,
+                attempt,
+                MAX_SEND_RETRIES,
+            )
+            await asyncio.sleep(delay)
+
+    async def _send_payload(
+        self, payload: Dict[str, Any], content_type: str = "message"
+    ) -> Mapping[str, Any]:
+        """
+        Send one message payload and handle API errors.
+
+        Args:
+            payload: Graph API message payload, including the recipient
+            content_type: What is being sent, used in log messages
+
+        Returns:
+            Lazily parsed response data from the API, or an error dict on
+            failure
+        """
+        phone_number = payload["to"]
+        try:
+            response = await self._post(self.url, json=payload)
+
+            if not response.is_success:
+                response_data = _parse_json(response)
+                self._handle_api_error(response_data, phone_number, content_type)
+                return {"error": self._format_error_message(response_data)}
+
+            self.logger.info("Sent %s to %s", content_type, phone_number)
+            return LazyJSONResponse(response)
+        except Exception as e:
+            error_msg = f"Exception sending {content_type}: {str(e)}"
+            self.logger.error(error_msg)
+            return {"error": {"message": error_msg, "type": "Exception"}}
+
+    def preprocess(self, data: Dict[Any, Any]) -> Dict[Any, Any]:
+        """Preprocess webhook data before handling"""
+        if not data.get("object"):
+            return data
+        try:
+            return data["entry"][0]["changes"][0]["value"] or data
+        except (KeyError, IndexError, TypeError):
+            return data
 
     async def send_message(
         self,
@@ -149,157 +458,209 @@ class WhatsApp(MessagingClient):
         phone_number: str,
         recipient_type: str = "individual",
         preview_url: bool = True,
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Send a text message to a WhatsApp user."""
+        payload = self._text_payload(message, recipient_type, preview_url)
+        payload["to"] = phone_number
+        return await self._batcher.submit(payload)
+
+    def _text_payload(
+        self, message: str, recipient_type: str, preview_url: bool
+    ) -> Dict[str, Any]:
+        """Build a text message payload without a recipient."""
+        return _payload(
+            "text", recipient_type, text={"preview_url": preview_url, "body": message}
+        )
 
-        data = {
-            "messaging_product": "whatsapp",
-            "recipient_type": recipient_type,
-            "to": phone_number,
-            "type": "text",
-            "text": {"preview_url": preview_url, "body": message},
-        }
+    async def broadcast(
+        self,
+        message: str,
+        recipients: List[str],
+        recipient_type: str = "individual",
+        preview_url: bool = True,
+        concurrency: int = MAX_BROADCAST_CONCURRENCY,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Send the same text message to many WhatsApp users concurrently.
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.url, headers=self.headers, json=data)
-                response_data = response.json()
+        Each distinct phone number is messaged once, even if it appears in
+        ``recipients`` more than once.
 
-                if response.status_code != 200:
-                    self._handle_api_error(response_data, phone_number)
-                else:
-                    self.logger.info(f"Sent message to {phone_number}")
+        Args:
+            message: Text to send
+            recipients: Phone numbers to send to
+            recipient_type: WhatsApp recipient type
+            preview_url: Whether WhatsApp should render link previews
+            concurrency: Largest number of sends in flight at once
 
-                return response_data
-        except Exception as e:
-            self.logger.error(f"Exception sending message to {phone_number}: {str(e)}")
-            return {"error": {"message": str(e), "type": "Exception"}}
+        Returns:
+            Response data for each recipient, in the order given
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        # Build the shared part of the payload once; each recipient only
+        # adds its own "to" field
+        template = self._text_payload(message, recipient_type, preview_url)
+
+        async def send(phone_number: str) -> Mapping[str, Any]:
+            async with semaphore:
+                return await self._send_payload({**template, "to": phone_number})
+
+        unique = list(dict.fromkeys(recipients))
+        results = dict(
+            zip(unique, await asyncio.gather(*(send(number) for number in unique)))
+        )
+        return [results[number] for number in recipients]
 
     async def send_media(
         self,
         media_items: Union[MediaItem, List[MediaItem]],
         phone_number: str,
         recipient_type: str = "individual",
-    ) -> List[Dict[str, Any]]:
-        """Send media to a WhatsApp user."""
+    ) -> List[Mapping[str, Any]]:
+        """Send media to a WhatsApp user, dispatching all items concurrently."""
         if not isinstance(media_items, list):
             media_items = [media_items]
-
-        responses = []
-        async with httpx.AsyncClient() as client:
-            for item in media_items:
-                response_data = await self._send_single_media_item(
-                    client, item, phone_number, recipient_type
+        if not media_items:
+            return []
+        media_items = [MediaItem.from_dict(item) for item in media_items]
+
+        # Most calls send a single item; await it directly rather than
+        # wrapping it in a task for gather
+        if len(media_items) == 1:
+            return [
+                await self._send_single_media_item(
+                    media_items[0], phone_number, recipient_type
                 )
-                responses.append(response_data)
-
-        return responses
+            ]
+        return list(
+            await asyncio.gather(
+                *(
+                    self._send_single_media_item(item, phone_number, recipient_type)
+                    for item in media_items
+                )
+            )
+        )
 
-    async def _download_video(
-        self, client: httpx.AsyncClient, video_url: str, filename: str
-    ) -> str:
+    async def _download_video(self, video_url: str) -> SpooledTemporaryFile:
         """
-        Download a video from URL to local storage.
+        Download a video from URL into a spooled buffer.
 
         Args:
-            client: httpx async client
             video_url: URL of the video to download
-            filename: Name to save the file as
 
         Returns:
-            Path to the downloaded file
+            Buffer holding the video, rewound to the start; the caller closes it
         """
-        local_path = os.path.join(TEMP_DIR, filename)
+        buffer = SpooledTemporaryFile(max_size=VIDEO_SPOOL_MAX_SIZE)
+
+        # Never send the Graph API token to third-party video hosts
+        request = self._client.build_request("GET", video_url)
+        del request.headers["Authorization"]
 
         try:
-            async with client.stream("GET", video_url) as response:
-                if response.status_code == 200:
-                    with open(local_path, "wb") as f:
-                        async for chunk in response.aiter_bytes():
-                            f.write(chunk)
-                    return local_path
-                else:
+            response = await self._client.send(request, stream=True)
+            try:
+                if not response.is_success:
                     raise Exception(f"Failed to download video: {response.status_code}")
+                async for chunk in response.aiter_bytes(chunk_size=VIDEO_CHUNK_SIZE):
+                    buffer.write(chunk)
+            finally:
+                await response.aclose()
         except Exception as e:
             self.logger.error(f"Error downloading video: {str(e)}")
-            if os.path.exists(local_path):
-                os.remove(local_path)
+            buffer.close()
             raise
 
+        buffer.seek(0)
+        return buffer
+
     async def _upload_video_to_whatsapp(
-        self, client: httpx.AsyncClient, video_path: str
+        self, video_file: SpooledTemporaryFile, filename: str
     ) -> str:
         """
         Upload a video to WhatsApp's media endpoint.
 
         Args:
-            client: httpx async client
-            video_path: Path to the local video file
+            video_file: Buffer holding the video
+            filename: File name reported in the multipart upload
 
         Returns:
             Media ID from WhatsApp
         """
-        upload_url = f"{self.v15_base_url}/{self.phone_number_id}/media"
+        # httpx rewinds the file and streams it in chunks (again on each
+        # retry), so the video is never held as one bytes object
+        files = {"file": (filename, _SpoolReader(video_file), "video/mp4")}
+        data = {"messaging_product": "whatsapp", "type": "video/mp4"}
 
-        with open(video_path, "rb") as video_file:
-            files = {"file": (os.path.basename(video_path), video_file, "video/mp4")}
-            data = {"messaging_product": "whatsapp", "type": "video/mp4"}
+        response = await self._post(self.upload_url, files=files, data=data)
 
-            response = await client.post(
-                upload_url,
-                files=files,
-                data=data,
-                headers={"Authorization": f"Bearer {self.token}"},
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("id")
-            else:
-                raise Exception(f"Failed to upload video: {response.text}")
+        if response.is_success:
+            result = _parse_json(response)
+            return result.get("id")
+        else:
+            raise Exception(f"Failed to upload video: {response.text}")
 
-    async def _handle_video_url(
-        self, client: httpx.AsyncClient, url: str, filename: str
-    ) -> str:
+    async def _handle_video_url(self, url: str, filename: str) -> str:
         """
         Handle video URL by downloading and uploading to WhatsApp.
 
+        Media IDs are cached per URL, so repeat sends of the same video skip
+        the download and upload entirely.
+
         Args:
-            client: httpx async client
             url: Video URL
-            filename: Name to save the file as
+            filename: File name reported in the upload
 
         Returns:
             WhatsApp media ID
         """
-        local_path = None
-        try:
-            # Download video
-            local_path = await self._download_video(client, url, filename)
-            self.logger.info(f"Downloaded video to {local_path}")
-
-            # Upload to WhatsApp
-            media_id = await self._upload_video_to_whatsapp(client, local_path)
-            self.logger.info(f"Uploaded video, got media ID: {media_id}")
-
-            return media_id
-
-        finally:
-            # Cleanup: Delete local file
-            if local_path and os.path.exists(local_path):
-                os.remove(local_path)
-                self.logger.info(f"Cleaned up local file: {local_path}")
+        cached = self._media_id_cache.get(url)
+        if cached:
+            if cached[1] > time.monotonic():
+                self._media_id_cache.move_to_end(url)
+                self.logger.info("Reusing uploaded media ID for %s", url)
+                return cached[0]
+            del self._media_id_cache[url]
+
+        # Download video, then upload it straight from the buffer
+        with await self._download_video(url) as video_file:
+            self.logger.info("Downloaded video from %s", url)
+            media_id = await self._upload_video_to_whatsapp(video_file, filename)
+            self.logger.info("Uploaded video, got media ID: %s", media_id)
+
+        if media_id:
+            expires_at = time.monotonic() + MEDIA_ID_TTL
+            self._media_id_cache[url] = (media_id, expires_at)
+            self._media_id_cache.move_to_end(url)
+            if len(self._media_id_cache) > MEDIA_ID_CACHE_SIZE:
+                self._media_id_cache.popitem(last=False)
+        return media_id
 
     async def _send_single_media_item(
         self,
-        client: httpx.AsyncClient,
         item: MediaItem,
         phone_number: str,
         recipient_type: str = "individual",
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Send a single media item to a WhatsApp user."""
 
-        media_type = item.get("type", "").lower()
+        media_type = item.type.lower()
+
+        # Fast path for the common case: an image with an absolute https link
+        # needs no URL rewriting, validation or upload. Anything else,
+        # including a missing URL, takes the checked path below so it gets
+        # its own error result instead of failing the whole send_media batch
+        if (
+            media_type == "image"
+            and not item.media_id
+            and isinstance(item.url, str)
+            and item.url.startswith("https://")
+        ):
+            image = {"link": item.url}
+            if item.caption:
+                image["caption"] = item.caption
+            payload = _payload("image", recipient_type, to=phone_number, image=image)
+            return await self._send_payload(payload, media_type)
 
         # Validate media type
         if media_type not in ["image", "video"]:
@@ -307,27 +668,22 @@ class WhatsApp(MessagingClient):
             return {"error": f"Unsupported media type: {media_type}"}
 
         # Prepare base payload
-        payload = {
-            "messaging_product": "whatsapp",
-            "recipient_type": recipient_type,
-            "to": phone_number,
-            "type": media_type,
-        }
+        payload = _payload(media_type, recipient_type, to=phone_number)
 
         try:
             # Handle media_id if present
-            if media_id := item.get("media_id"):
+            if media_id := item.media_id:
                 payload[media_type] = {"id": media_id}
             # Handle URL if present
-            elif url := item.get("url"):
+            elif url := item.url:
                 if url.startswith("/"):
                     # url = f"{MEDIA_BASE_URL}{url}" # TODO: Uncomment this line
                     url = "https://images.unsplash.com/photo-1454496522488-7a8e488e8606"
                 else:
-                    self.logger.info(f"URL is already absolute: {url}")
+                    self.logger.info("URL is already absolute: %s", url)
 
                 # Validate the URL format
-                if not re.match(r"^https?://", url):
+                if not url.startswith(("http://", "https://")):
                     self.logger.error(f"Invalid URL format: {url}")
                     return {"error": f"Invalid URL format: {url}"}
 
@@ -335,8 +691,9 @@ class WhatsApp(MessagingClient):
                 if media_type == "video" and (
                     "pexels.com" in url or "unsplash.com" in url
                 ):
+                    url_digest = hashlib.sha1(url.encode()).hexdigest()[:16]
                     media_id = await self._handle_video_url(
-                        client, url, f"temp_video_{hash(url)}.mp4"
+                        url, f"temp_video_{url_digest}.mp4"
                     )
                     payload[media_type] = {"id": media_id}
                 else:
@@ -346,23 +703,15 @@ class WhatsApp(MessagingClient):
                 return {"error": f"Neither media_id nor URL provided for {media_type}"}
 
             # Add caption if present
-            if caption := item.get("caption"):
+            if caption := item.caption:
                 payload[media_type]["caption"] = caption
-
-            self.logger.info(f"Sending {media_type} to {phone_number}")
-            response = await client.post(self.url, headers=self.headers, json=payload)
-            response_data = response.json()
-
-            if response.status_code != 200:
-                self._handle_api_error(response_data, phone_number, media_type)
-                return {"error": self._format_error_message(response_data)}
-
-            return response_data
         except Exception as e:
             error_msg = f"Exception sending {media_type}: {str(e)}"
             self.logger.error(error_msg)
             return {"error": {"message": error_msg, "type": "Exception"}}
 
+        return await self._send_payload(payload, media_type)
+
     async def send_interactive_buttons(
         self,
         header_text: str,
@@ -370,62 +719,44 @@ class WhatsApp(MessagingClient):
         buttons: List[ButtonItem],
         phone_number: str,
         recipient_type: str = "individual",
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """Send interactive buttons to a WhatsApp user."""
+        buttons = [ButtonItem.from_dict(btn) for btn in buttons]
 
         if len(buttons) > 3:
             return await self.send_interactive_list(
                 header_text,
                 body_text,
                 "Select an option",
-                [{"title": "Options", "items": buttons}],
+                [SectionItem(title="Options", items=buttons)],
                 phone_number,
                 recipient_type,
             )
 
-        payload = {
-            "messaging_product": "whatsapp",
-            "recipient_type": recipient_type,
-            "to": phone_number,
-            "type": "interactive",
-            "interactive": {
+        payload = _payload(
+            "interactive",
+            recipient_type,
+            to=phone_number,
+            interactive={
                 "type": "button",
                 "body": {"text": body_text},
                 "action": {
                     "buttons": [
                         {
                             "type": "reply",
-                            "reply": {"id": btn["id"], "title": btn["title"]},
+                            "reply": {"id": btn.id, "title": btn.title},
                         }
                         for btn in buttons
                     ]
                 },
             },
-        }
+        )
 
         # Add header if provided
         if header_text:
             payload["interactive"]["header"] = {"type": "text", "text": header_text}
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.url, headers=self.headers, json=payload
-                )
-                response_data = response.json()
-
-                if response.status_code != 200:
-                    self._handle_api_error(
-                        response_data, phone_number, "interactive buttons"
-                    )
-                else:
-                    self.logger.info(f"Sent interactive buttons to {phone_number}")
-
-                return response_data
-        except Exception as e:
-            error_msg = f"Exception sending interactive buttons: {str(e)}"
-            self.logger.error(error_msg)
-            return {"error": {"message": error_msg, "type": "Exception"}}
+        return await self._send_payload(payload, "interactive buttons")
 
     async def send_interactive_list(
         self,
@@ -435,59 +766,69 @@ class WhatsApp(MessagingClient):
         sections: List[SectionItem],
         phone_number: str,
         recipient_type: str = "individual",
+    ) -> Union[Mapping[str, Any], List[Mapping[str, Any]]]:
+        """
+        Send an interactive list to a WhatsApp user.
+
+        Lists with more rows or sections than WhatsApp allows are split into
+        several list messages sent concurrently; a list of responses is
+        returned in that case.
+        """
+        sections = [SectionItem.from_dict(section) for section in sections]
+        payloads = [
+            self._build_list_payload(
+                header_text, body_text, button_text, chunk, phone_number, recipient_type
+            )
+            for chunk in list(_chunk_sections(sections)) or [[]]
+        ]
+
+        if len(payloads) == 1:
+            return await self._send_payload(payloads[0], "interactive list")
+        return list(
+            await asyncio.gather(
+                *(
+                    self._send_payload(payload, "interactive list")
+                    for payload in payloads
+                )
+            )
+        )
+
+    def _build_list_payload(
+        self,
+        header_text: str,
+        body_text: str,
+        button_text: str,
+        sections: List[SectionItem],
+        phone_number: str,
+        recipient_type: str,
     ) -> Dict[str, Any]:
-        """Send an interactive list to a WhatsApp user."""
-
-        payload = {
-            "messaging_product": "whatsapp",
-            "recipient_type": recipient_type,
-            "to": phone_number,
-            "type": "interactive",
-            "interactive": {
+        """Build an interactive list payload, truncating text to API limits."""
+
+        payload = _payload(
+            "interactive",
+            recipient_type,
+            to=phone_number,
+            interactive={
                 "type": "list",
                 "body": {"text": body_text},
-                "action": {"button": button_text, "sections": []},
+                "action": {
+                    "button": button_text[:MAX_LIST_BUTTON_TEXT],
+                    "sections": [
+                        {
+                            "title": section.title[:MAX_LIST_TITLE],
+                            "rows": [_list_row(item) for item in section.items],
+                        }
+                        for section in sections
+                    ],
+                },
             },
-        }
+        )
 
         # Add header if provided
         if header_text:
             payload["interactive"]["header"] = {"type": "text", "text": header_text}
 
-        # Prepare sections
-        for section in sections:
-            section_data = {"title": section["title"], "rows": []}
-
-            for item in section["items"]:
-                section_data["rows"].append(
-                    {
-                        "id": item["id"],
-                        "title": item["title"],
-                        "description": item.get("description", ""),
-                    }
-                )
-
-            payload["interactive"]["action"]["sections"].append(section_data)
-
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.url, headers=self.headers, json=payload
-                )
-                response_data = response.json()
-
-                if response.status_code != 200:
-                    self._handle_api_error(
-                        response_data, phone_number, "interactive list"
-                    )
-                else:
-                    self.logger.info(f"Sent interactive list to {phone_number}")
-
-                return response_data
-        except Exception as e:
-            error_msg = f"Exception sending interactive list: {str(e)}"
-            self.logger.error(error_msg)
-            return {"error": {"message": error_msg, "type": "Exception"}}
+        return payload
 
     def _handle_api_error(
         self,
@@ -511,7 +852,9 @@ class WhatsApp(MessagingClient):
             )
 
         self.logger.warning(
-            f"{content_type.capitalize()} not delivered to {phone_number} due to API error"
+            "%s not delivered to %s due to API error",
+            content_type.capitalize(),
+            phone_number,
         )
 
     def _format_error_message(self, response_data: Dict[str, Any]) -> Dict[str, str]:
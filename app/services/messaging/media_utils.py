@@ -1,45 +1,93 @@
-import httpx
-from typing import Optional
+import asyncio
+import base64
+import contextlib
+import functools
+import time
+from typing import Dict, Optional, Set, Tuple
 from pathlib import Path
 import uuid
 import os
-from app.config import settings
+from collections import defaultdict
+from app.services.http import GRAPH_CLIENT
 from app.logging import setup_logger
 
 logger = setup_logger(__name__)
 
-# Ensure media directory exists
+# URL-safe base64 of a UUID's 16 bytes gives 22-character unique filenames
+_b64 = base64.urlsafe_b64encode
+
 MEDIA_DIR = Path("media")
 IMAGES_DIR = MEDIA_DIR / "images"
-MEDIA_DIR.mkdir(exist_ok=True)
-IMAGES_DIR.mkdir(exist_ok=True)
+
+# Read size for streamed downloads; bounds memory use per download
+DOWNLOAD_CHUNK_SIZE = 64 << 10
+
+# WhatsApp media download URLs stay valid for about five minutes; reuse
+# them for a little less than that
+MEDIA_URL_TTL = 240
+MEDIA_URL_CACHE_SIZE = 10_000
+
+# Media ID -> (download URL, expiry timestamp)
+_media_url_cache: Dict[str, Tuple[str, float]] = {}
+
+
+class _LookupLock:
+    """Per-media-ID lock plus the number of tasks holding or awaiting it."""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+# Media ID -> lock held while its URL is being looked up; dropped once no
+# task holds or waits on it, so every concurrent lookup shares one lock
+_media_url_locks: Dict[str, _LookupLock] = {}
 
 # Store active media files for cleanup later
-active_media = {}
+active_media: Dict[str, Set[str]] = defaultdict(set)
 
 
-async def save_whatsapp_image(media_id: str, client_id: str) -> Optional[str]:
+@functools.cache
+def _images_dir() -> str:
+    """Create the images directory on first use and return it as a path prefix."""
+    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    return str(IMAGES_DIR) + os.sep
+
+
+async def _retrieve_media_url(media_id: str) -> Optional[str]:
     """
-    Download and save an image from WhatsApp media ID.
+    Look up the download URL for a WhatsApp media ID, caching it briefly.
+
+    Concurrent lookups of the same ID share a single Graph API request.
 
     Args:
         media_id: The WhatsApp media ID
-        client_id: Client identifier for tracking active media
 
     Returns:
-        Public URL to access the image or None if download failed
+        The media download URL or None if the lookup failed
     """
-    logger.info(f"Processing WhatsApp image with ID: {media_id} for client {client_id}")
-
+    cached = _media_url_cache.get(media_id)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
+    entry = _media_url_locks.get(media_id)
+    if entry is None:
+        entry = _media_url_locks[media_id] = _LookupLock()
+    entry.users += 1
     try:
-        # Step 1: Get media URL from WhatsApp API
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://graph.facebook.com/v17.0/{media_id}/",
-                headers={"Authorization": f"Bearer {settings.WHATSAPP_TOKEN}"},
+        async with entry.lock:
+            # Another task may have fetched it while we waited for the lock
+            cached = _media_url_cache.get(media_id)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+
+            response = await GRAPH_CLIENT.get(
+                f"https://graph.facebook.com/v17.0/{media_id}/"
             )
 
-            if response.status_code != 200:
+            if not response.is_success:
                 logger.error(
                     f"Failed to retrieve media URL. Status code: {response.status_code}"
                 )
@@ -52,39 +100,78 @@ async def save_whatsapp_image(media_id: str, client_id: str) -> Optional[str]:
                 logger.error(f"No URL found in media response: {data}")
                 return None
 
-            whatsapp_url = data["url"]
-            logger.info(f"Successfully retrieved WhatsApp URL for ID {media_id}")
-
-        # Step 2: Download the image
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                whatsapp_url,
-                headers={"Authorization": f"Bearer {settings.WHATSAPP_TOKEN}"},
+            logger.info(
+                "Successfully retrieved WhatsApp URL for ID %s over %s",
+                media_id,
+                response.http_version,
             )
 
-            if response.status_code != 200:
+            if len(_media_url_cache) >= MEDIA_URL_CACHE_SIZE:
+                # Evict the oldest entry
+                _media_url_cache.pop(next(iter(_media_url_cache)))
+            _media_url_cache[media_id] = (data["url"], time.monotonic() + MEDIA_URL_TTL)
+            return data["url"]
+    finally:
+        entry.users -= 1
+        if not entry.users:
+            del _media_url_locks[media_id]
+
+
+async def save_whatsapp_image(media_id: str, client_id: str) -> Optional[str]:
+    """
+    Download and save an image from WhatsApp media ID.
+
+    Args:
+        media_id: The WhatsApp media ID
+        client_id: Client identifier for tracking active media
+
+    Returns:
+        Public URL to access the image or None if download failed
+    """
+    logger.info(
+        "Processing WhatsApp image with ID: %s for client %s", media_id, client_id
+    )
+
+    try:
+        # Step 1: Get media URL from WhatsApp API
+        whatsapp_url = await _retrieve_media_url(media_id)
+        if whatsapp_url is None:
+            return None
+
+        # Step 2: Stream the image straight to a local file with a unique
+        # name, so only one chunk is held in memory at a time
+        unique_filename = _b64(uuid.uuid4().bytes).rstrip(b"=").decode() + ".jpg"
+        file_path = _images_dir() + unique_filename
+
+        async with GRAPH_CLIENT.stream("GET", whatsapp_url) as response:
+            if not response.is_success:
                 logger.error(
                     f"Failed to download image. Status code: {response.status_code}"
                 )
                 return None
 
-            # Step 3: Save to local file with unique name
-            unique_filename = f"{uuid.uuid4()}.jpg"
-            file_path = IMAGES_DIR / unique_filename
-
-            with open(file_path, "wb") as file:
-                file.write(response.content)
+            # A buffered file retries short writes, so every chunk lands in
+            # full; chunks larger than its buffer go straight to the file
+            try:
+                with open(file_path, "wb") as file:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        file.write(chunk)
+            except BaseException:
+                # Don't leave a truncated image behind
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(file_path)
+                raise
 
-            # Step 4: Create public URL and track for cleanup
-            public_url = f"/media/images/{unique_filename}"
+        # Step 4: Create public URL and track for cleanup
+        public_url = "/media/images/" + unique_filename
 
-            # Track this file for later cleanup
-            active_media[client_id] = active_media.get(client_id, []) + [str(file_path)]
+        # Track this file for later cleanup
+        active_media[client_id].add(file_path)
 
-            logger.info(f"Image saved to {file_path}")
-            logger.info(f"Public URL: {public_url}")
+        logger.info("Image saved to %s", file_path)
+        logger.info("Public URL: %s", public_url)
 
-            return public_url
+        return public_url
 
     except Exception as e:
         logger.error(f"Error processing WhatsApp image: {str(e)}")
@@ -98,17 +185,19 @@ def cleanup_client_media(client_id: str) -> None:
     Args:
         client_id: Client identifier whose media files should be deleted
     """
-    if client_id not in active_media:
+    # Take the files out of tracking up front so a concurrent save for the
+    # same client starts a fresh set
+    file_paths = active_media.pop(client_id, None)
+    if not file_paths:
         return
 
-    for file_path in active_media[client_id]:
+    for file_path in file_paths:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"Deleted media file: {file_path}")
+            os.unlink(file_path)
+            logger.info("Deleted media file: %s", file_path)
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error deleting media file {file_path}: {str(e)}")
 
-    # Clear tracking data
-    active_media.pop(client_id, None)
-    logger.info(f"Cleaned up all media for client {client_id}")
+    logger.info("Cleaned up all media for client %s", client_id)
@@ -0,0 +1,42 @@
+"""
+Token-bucket rate limiter for outbound messaging API calls.
+
+The Graph API caps how many messages a business phone number may send per
+second. Spending a token per request keeps the steady-state rate under that
+cap while still letting short bursts (a workflow step sending several
+messages at once) go out immediately instead of collecting 429s and retries.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+
+    Args:
+        rate: Tokens added per second (sustained requests per second)
+        capacity: Largest number of tokens held (burst size)
+    """
+
+    __slots__ = ("capacity", "rate", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Take one token, waiting for the bucket to refill if it is empty."""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
@@ -1,10 +1,15 @@
+from collections import OrderedDict
 from enum import Enum, auto
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
+import logging
 
+from app.config import settings
 from app.logging import setup_logger
 from app.services.types import WorkflowStateType
 
+logger = setup_logger(__name__)
+
 
 class WorkflowState(Enum):
     INIT = auto()
@@ -39,11 +44,52 @@ class WorkflowState(Enum):
     FIELD_COLLECTION = auto()
 
 
+# Enum member attributes go through descriptors; look them up once instead
+_STATE_NAMES = {state: state.name for state in WorkflowState}
+_STATE_VALUES = {state: state.value for state in WorkflowState}
+
+
+class ClientRecord:
+    """Workflow state and context for a single client."""
+
+    __slots__ = ("context", "state")
+
+    def __init__(self):
+        self.state = WorkflowState.INIT
+        self.context: Dict[str, Any] = {}
+
+
 class StateManager:
+    __slots__ = ("_clients", "_max_clients")
+
+    logger = logger
+
     def __init__(self):
-        self.logger = setup_logger(__name__)
-        self._state_store: Dict[str, WorkflowState] = {}
-        self._context_store: Dict[str, Dict[str, Any]] = {}
+        # State and context live on one record per client, so each access
+        # is a single dict lookup. Records are kept in least-recently-used
+        # order and the oldest is dropped past the cap; an evicted client
+        # simply starts over from INIT on their next message.
+        self._clients: OrderedDict[str, ClientRecord] = OrderedDict()
+        self._max_clients = settings.MAX_TRACKED_CLIENTS
+
+    def _lookup(self, client_id: str) -> Optional[ClientRecord]:
+        """Return the record for a client, if any, marking it recently used."""
+        record = self._clients.get(client_id)
+        if record is not None:
+            self._clients.move_to_end(client_id)
+        return record
+
+    def _create(self, client_id: str) -> ClientRecord:
+        """Store a fresh record for a client, evicting the oldest past the cap."""
+        record = self._clients[client_id] = ClientRecord()
+        self._clients.move_to_end(client_id)
+        if len(self._clients) > self._max_clients:
+            self._clients.popitem(last=False)
+        return record
+
+    def _record(self, client_id: str) -> ClientRecord:
+        """Return the record for a client, creating it if needed."""
+        return self._lookup(client_id) or self._create(client_id)
 
     def get_state(self, client_id: str) -> WorkflowState:
         """
@@ -57,13 +103,16 @@ class StateManager:
         Returns:
             The current workflow state for the client
         """
-        if client_id not in self._state_store:
-            self._state_store[client_id] = WorkflowState.INIT
+        record = self._lookup(client_id)
+        if record is None:
+            record = self._create(client_id)
             self.logger.info(
-                f"Initialized state for {client_id} to {WorkflowState.INIT.name}"
+                "Initialized state for %s to %s",
+                client_id,
+                _STATE_NAMES[WorkflowState.INIT],
             )
 
-        return self._state_store[client_id]
+        return record.state
 
     def set_state(self, client_id: str, state: WorkflowState) -> None:
         """
@@ -73,12 +122,18 @@ class StateManager:
             client_id: The client identifier
             state: The new workflow state
         """
-        prev_state = (
-            self.get_state(client_id).name if client_id in self._state_store else "None"
-        )
-        self._state_store[client_id] = state
+        record = self._lookup(client_id)
+        if record is None:
+            prev_state = "None"
+            record = self._create(client_id)
+        else:
+            prev_state = _STATE_NAMES[record.state]
+        record.state = state
         self.logger.info(
-            f"State transition for {client_id}: {prev_state} -> {state.name}"
+            "State transition for %s: %s -> %s",
+            client_id,
+            prev_state,
+            _STATE_NAMES[state],
         )
 
         # self.logger.info(
@@ -97,10 +152,7 @@ class StateManager:
         Returns:
             The context dictionary for the client
         """
-        if client_id not in self._context_store:
-            self._context_store[client_id] = {}
-
-        return self._context_store[client_id]
+        return self._record(client_id).context
 
     def update_context(self, client_id: str, context: Dict[str, Any]) -> None:
         """
@@ -110,9 +162,12 @@ class StateManager:
             client_id: The client identifier
             context: The new context dictionary
         """
-        self._context_store[client_id] = context
+        self._record(client_id).context = context
 
-        # Log a shortened version of the context for debugging
+        # Log a shortened version of the context for debugging; serializing
+        # the whole context is skipped unless debug logging is on
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         try:
             context_str = json.dumps(context, default=str)
             if len(context_str) > 200:
@@ -120,7 +175,7 @@ class StateManager:
             else:
                 context_preview = context_str
 
-            self.logger.debug(f"Updated context for {client_id}: {context_preview}")
+            self.logger.debug("Updated context for %s: %s", client_id, context_preview)
         except Exception as e:
             self.logger.error(f"Error logging context: {e}")
 
@@ -131,9 +186,8 @@ class StateManager:
         Args:
             client_id: The client identifier
         """
-        self._state_store[client_id] = WorkflowState.INIT
-        self._context_store[client_id] = {}
-        self.logger.info(f"Reset state and context for {client_id}")
+        self._create(client_id)
+        self.logger.info("Reset state and context for %s", client_id)
 
     def get_context_value(self, client_id: str, key: str, default: Any = None) -> Any:
         """
@@ -162,9 +216,8 @@ class StateManager:
         context = self.get_context(client_id)
         context[key] = value
         self.update_context(client_id, context)
-        self.logger.debug(f"Set context value for {client_id}: {key} = {value}")
+        self.logger.debug("Set context value for %s: %s = %s", client_id, key, value)
 
     def get_state_name(self, client_id: str) -> WorkflowStateType:
         """Get the state name for a client"""
-        state = self.get_state(client_id)
-        return state.value
+        return _STATE_VALUES[self.get_state(client_id)]
@@ -18,11 +18,13 @@ TEST_VIDEOS: List[Dict[str, str]] = [
 
 
 async def main():
-    whatsapp = WhatsApp(token=TEST_TOKEN, phone_number_id=TEST_PHONE_NUMBER_ID)
-    await whatsapp.send_media(
-        media_items=TEST_VIDEOS,
-        phone_number=TEST_PHONE_NUMBER,
-    )
+    async with WhatsApp(
+        token=TEST_TOKEN, phone_number_id=TEST_PHONE_NUMBER_ID
+    ) as whatsapp:
+        await whatsapp.send_media(
+            media_items=TEST_VIDEOS,
+            phone_number=TEST_PHONE_NUMBER,
+        )
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, TypedDict, Literal, Any
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Literal, Any, Union
 from pydantic import BaseModel, Field
 
 
@@ -41,24 +42,64 @@ WorkflowStateType = Literal[
 MediaSourceType = Literal["upload", "search"]
 
 
-class MediaItem(Dict[str, str]):
+@dataclass(slots=True, frozen=True)
+class MediaItem:
     """Media item for WhatsApp messages"""
 
-    pass
+    type: str
+    url: str = ""
+    media_id: str = ""
+    caption: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Union["MediaItem", Dict[str, str]]) -> "MediaItem":
+        """Build a media item from a plain dict, passing existing items through"""
+        if isinstance(data, cls):
+            return data
+        return cls(
+            type=data.get("type") or "",
+            url=data.get("url") or "",
+            media_id=data.get("media_id") or "",
+            caption=data.get("caption") or "",
+        )
 
 
-class ButtonItem(TypedDict):
-    """Type definition for a button item"""
+@dataclass(slots=True, frozen=True)
+class ButtonItem:
+    """Button or list row for interactive messages"""
 
     id: str
     title: str
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Union["ButtonItem", Dict[str, str]]) -> "ButtonItem":
+        """Build a button from a plain dict, passing existing buttons through"""
+        if isinstance(data, cls):
+            return data
+        return cls(
+            id=data["id"] or "",
+            title=data["title"] or "",
+            description=data.get("description") or "",
+        )
 
 
-class SectionItem(TypedDict):
-    """Type definition for a section item"""
+@dataclass(slots=True, frozen=True)
+class SectionItem:
+    """Section of an interactive list"""
 
     title: str
-    rows: List[ButtonItem]
+    items: List[ButtonItem]
+
+    @classmethod
+    def from_dict(cls, data: Union["SectionItem", Dict[str, Any]]) -> "SectionItem":
+        """Build a section from a plain dict, converting its items to buttons"""
+        if isinstance(data, cls):
+            return data
+        return cls(
+            title=data["title"] or "",
+            items=[ButtonItem.from_dict(item) for item in data["items"]],
+        )
 
 
 class WorkflowContext(BaseModel):
@@ -11,9 +11,20 @@ from app.services.content.template_config import (
     get_template_config,
     get_required_keys,
 )
-from app.services.types import WorkflowContext, MediaItem
+from app.services.types import ButtonItem, WorkflowContext, MediaItem
 from app.services.messaging.media_utils import save_whatsapp_image, cleanup_client_media
 
+# Fixed scheduling choices, built once; ButtonItem is frozen so they can be shared
+_SCHEDULE_BUTTONS = (
+    ButtonItem(id="later", title="Later Today"),
+    ButtonItem(id="tomorrow", title="Tomorrow"),
+    ButtonItem(id="next week", title="Next Week"),
+    ButtonItem(id="now", title="Post Now"),
+)
+
+# Captions for the searched image options offered in the media prompt
+_OPTION_CAPTIONS = ("Option 1", "Option 2", "Option 3", "Option 4")
+
 
 class CaptionHandler(BaseHandler):
     """Handler for caption input state"""
@@ -26,14 +37,10 @@ class CaptionHandler(BaseHandler):
     ):
         super().__init__(client, state_manager)
         self.content_generator = content_generator
-        from app.services.content.image_service import MediaService
-
-        self.media_service = MediaService()
+        self.media_service = content_generator.media_service
 
     async def handle(self, client_id: str, message: str) -> None:
         """Handle caption input"""
-        context = WorkflowContext(**self.state_manager.get_context(client_id))
-
         # Check if we're waiting for image upload or selection
         current_state = self.state_manager.get_state(client_id)
         if current_state == WorkflowState.WAITING_FOR_MEDIA_UPLOAD:
@@ -60,10 +67,13 @@ class CaptionHandler(BaseHandler):
             await self.send_message(client_id, MESSAGES["caption_prompt"])
             return
 
+        # Built only once we know this method handles the message itself; the
+        # sub-handlers above load the context they need on their own
+        context = WorkflowContext(**self.state_manager.get_context(client_id))
+
         # Store the caption
         context.caption = message
         context.original_text = message
-        self.state_manager.update_context(client_id, context.model_dump())
 
         # Find appropriate template
         if not context.template_id:
@@ -76,9 +86,11 @@ class CaptionHandler(BaseHandler):
                 if template_id:
                     context.template_id = template_id
                     context.template_type = context.selected_content_type
-                    self.state_manager.update_context(client_id, context.model_dump())
                     break
 
+        # Persist the caption and template choice in one write
+        self.state_manager.update_context(client_id, context.model_dump())
+
         # For promo templates, collect required fields first
         if context.selected_content_type == "promo":
             # Ask for destination name if not provided
@@ -141,7 +153,8 @@ class CaptionHandler(BaseHandler):
             # CRITICAL: Update the state manager with the modified context
             self.state_manager.update_context(client_id, context.model_dump())
 
-            # Send the generated caption
+            # Send the generated caption; it must arrive before the media
+            # prompt that refers to it, so the two are not sent concurrently
             await self.send_message(
                 client_id, f"Here is the caption for the post: {context.caption}"
             )
@@ -464,10 +477,8 @@ class CaptionHandler(BaseHandler):
                             template_type=content_type,
                             context={
                                 "caption": context.caption,
-                                "destination_name": getattr(
-                                    context, "destination_name", ""
-                                ),
-                                "event_name": getattr(context, "event_name", ""),
+                                "destination_name": context.destination_name,
+                                "event_name": context.event_name,
                             },
                         )
 
@@ -484,18 +495,22 @@ class CaptionHandler(BaseHandler):
                                     client_id, context.model_dump()
                                 )
 
-                                # Show images for selection
-                                max_images = min(4, len(image_urls))
-                                for i in range(max_images):
-                                    image_url = image_urls[i]
-                                    await self.client.send_media(
+                                # Show images for selection, sent concurrently
+                                await self.send_media_gallery(
+                                    client_id,
+                                    [
                                         {
                                             "type": "image",
                                             "url": image_url,
-                                            "caption": f"Option {i + 1}",
-                                        },
-                                        client_id,
-                                    )
+                                            "caption": caption,
+                                        }
+                                        # zip stops at the shorter input, so at
+                                        # most len(_OPTION_CAPTIONS) are shown
+                                        for image_url, caption in zip(
+                                            image_urls, _OPTION_CAPTIONS
+                                        )
+                                    ],
+                                )
 
                                 # Update state for image selection
                                 self.state_manager.set_state(
@@ -1014,20 +1029,13 @@ class CaptionHandler(BaseHandler):
 
     async def send_scheduling_options(self, client_id: str) -> None:
         """Send scheduling options to the client"""
-        buttons = [
-            {"id": "later", "title": "Later Today"},
-            {"id": "tomorrow", "title": "Tomorrow"},
-            {"id": "next week", "title": "Next Week"},
-            {"id": "now", "title": "Post Now"},
-        ]
-
         await self.send_message(client_id, MESSAGES["schedule_prompt"])
 
         try:
             await self.client.send_interactive_buttons(
                 header_text="Schedule Selection",
                 body_text="When would you like to schedule your post?",
-                buttons=buttons,
+                buttons=_SCHEDULE_BUTTONS,
                 phone_number=client_id,
             )
         except Exception as e:
@@ -1042,8 +1050,9 @@ class CaptionHandler(BaseHandler):
         self, client_id: str, media_items: List[MediaItem]
     ) -> None:
         """Send a media gallery to the client"""
-        for item in media_items:
-            await self.client.send_media(media_items=[item], phone_number=client_id)
+        # One call for the whole gallery; send_media posts the items
+        # concurrently
+        await self.client.send_media(media_items=media_items, phone_number=client_id)
 
     async def handle_waiting_for_tip_details(
         self, client_id: str, message: str
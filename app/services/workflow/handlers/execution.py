@@ -5,10 +5,27 @@ from app.services.messaging.state_manager import StateManager, WorkflowState
 from app.services.workflow.handlers.base import BaseHandler
 from app.constants import MESSAGES
 from app.services.content.template_service import template_service
-from app.services.types import WorkflowContext
+from app.services.types import ButtonItem, WorkflowContext
 from app.services.messaging.media_utils import cleanup_client_media
 from app.services.content.switchboard import switchboard_service
 
+# Interactive buttons are immutable, so the fixed prompts share one copy
+_IMAGE_BUTTONS = (
+    ButtonItem(id="yes_images", title="Yes, include images"),
+    ButtonItem(id="no_images", title="No, caption only"),
+)
+_CONFIRMATION_BUTTONS = (
+    ButtonItem(id="yes", title="Yes, Continue"),
+    ButtonItem(id="no", title="No, Start Over"),
+)
+
+# Replies to the image inclusion prompt (button ids and typed text) mapped to
+# whether images should be included
+_IMAGE_DECISIONS = {
+    **dict.fromkeys(("yes_images", "yes", "y", "yes include images"), True),
+    **dict.fromkeys(("no_images", "no", "n", "no caption only"), False),
+}
+
 
 class ExecutionHandler(BaseHandler):
     """Handler for post execution state"""
@@ -35,13 +52,8 @@ class ExecutionHandler(BaseHandler):
             # Get the context to check content type
             context = WorkflowContext(**self.state_manager.get_context(client_id))
 
-            # Determine if this is video-based content
-            is_video_content = False
-            if hasattr(context, "is_video_content"):
-                is_video_content = context.is_video_content
-
             # Generate platform-specific media (images or videos)
-            if is_video_content:
+            if context.is_video_content:
                 await self.generate_platform_videos(client_id)
             else:
                 await self.generate_platform_images(client_id)
@@ -60,16 +72,11 @@ class ExecutionHandler(BaseHandler):
 
     async def ask_include_images(self, client_id: str) -> None:
         """Ask user if they want to include images in the post"""
-        buttons = [
-            {"id": "yes_images", "title": "Yes, include images"},
-            {"id": "no_images", "title": "No, caption only"},
-        ]
-
         try:
             await self.client.send_interactive_buttons(
                 header_text="Image Selection",
                 body_text=MESSAGES["image_inclusion_prompt"],
-                buttons=buttons,
+                buttons=_IMAGE_BUTTONS,
                 phone_number=client_id,
             )
             self.logger.info(f"Successfully sent image inclusion prompt to {client_id}")
@@ -88,7 +95,8 @@ class ExecutionHandler(BaseHandler):
         self.logger.info(f"Handling image decision for {client_id}, message: {message}")
 
         # Handle both button responses and text responses
-        if message in ["yes_images", "yes", "y", "yes include images"]:
+        include_images = _IMAGE_DECISIONS.get(message)
+        if include_images is True:
             context.include_images = True
             self.state_manager.update_context(client_id, context.model_dump())
 
@@ -97,7 +105,7 @@ class ExecutionHandler(BaseHandler):
 
             # Continue with generating images
             await self.generate_platform_images(client_id)
-        elif message in ["no_images", "no", "n", "no caption only"]:
+        elif include_images is False:
             context.include_images = False
             self.state_manager.update_context(client_id, context.model_dump())
 
@@ -152,7 +160,7 @@ class ExecutionHandler(BaseHandler):
         # Check if we should proceed with posting
         if message.lower() in ["post", "continue", "yes", "y"]:
             # Get the context to check if we're including images
-            include_images = getattr(context, "include_images", True)
+            include_images = context.include_images
 
             if include_images:
                 # If including images, generate platform-specific images
@@ -168,24 +176,48 @@ class ExecutionHandler(BaseHandler):
 
     async def generate_platform_images(self, client_id: str) -> None:
         """Generate images for each platform"""
-        self.logger.info(f"Starting generate_platform_images for {client_id}")
-        context = WorkflowContext(**self.state_manager.get_context(client_id))
+        await self._generate_platform_media(client_id, "image")
 
-        # Clear the waiting flag
-        context.waiting_for_image_decision = False
-        self.logger.info(f"Setting waiting_for_image_decision=False for {client_id}")
-        self.state_manager.update_context(client_id, context.model_dump())
+    async def generate_platform_videos(self, client_id: str) -> None:
+        """Generate videos for each platform"""
+        await self._generate_platform_media(client_id, "video")
 
-        # Generate platform-specific images using Switchboard Canvas
-        await self.send_message(client_id, "Editing images for each platform...")
+    async def _generate_platform_media(self, client_id: str, media_type: str) -> None:
+        """
+        Edit the selected media for each platform and send the results.
 
-        try:
-            # Log the context for debugging
+        Args:
+            client_id: The client's phone number
+            media_type: Either "image" or "video"
+        """
+        self.logger.info(f"Starting generate_platform_{media_type}s for {client_id}")
+        context = WorkflowContext(**self.state_manager.get_context(client_id))
+        is_video = media_type == "video"
+        fallback = context.selected_video if is_video else context.selected_image
+
+        if not is_video:
+            # Clear the waiting flag
+            context.waiting_for_image_decision = False
             self.logger.info(
-                f"Context for {client_id}: selected_image present: {bool(context.selected_image)}"
+                f"Setting waiting_for_image_decision=False for {client_id}"
             )
-            if context.selected_image:
-                self.logger.info(f"Selected image: {context.selected_image[:50]}...")
+            self.state_manager.update_context(client_id, context.model_dump())
+
+        # Generate platform-specific media using Switchboard Canvas
+        await self.send_message(
+            client_id, f"Editing {media_type}s for each platform..."
+        )
+
+        try:
+            if not is_video:
+                # Log the context for debugging
+                self.logger.info(
+                    f"Context for {client_id}: selected_image present: {bool(context.selected_image)}"
+                )
+                if context.selected_image:
+                    self.logger.info(
+                        f"Selected image: {context.selected_image[:50]}..."
+                    )
 
             for platform in context.selected_platforms:
                 # Get the content type for this platform
@@ -193,7 +225,7 @@ class ExecutionHandler(BaseHandler):
                     platform, context.selected_content_type
                 )
                 self.logger.info(
-                    f"Generating image for {platform} with content type {content_type}"
+                    f"Generating {media_type} for {platform} with content type {content_type}"
                 )
 
                 try:
@@ -204,7 +236,7 @@ class ExecutionHandler(BaseHandler):
 
                     # Log the prepared template data
                     self.logger.info(
-                        f"Prepared template data for {platform}_{content_type}: {template_data}"
+                        f"Prepared template data for {platform}_{content_type} {media_type}: {template_data}"
                     )
 
                     # Validate inputs for this template using the template service
@@ -231,7 +263,8 @@ class ExecutionHandler(BaseHandler):
 
                     # Double-check that main_image is set for events templates
                     if (
-                        content_type == "events"
+                        not is_video
+                        and content_type == "events"
                         and "main_image" not in validated_data
                         and context.selected_image
                     ):
@@ -245,164 +278,64 @@ class ExecutionHandler(BaseHandler):
                         template_id, validated_data
                     )
 
-                    # Create image with Switchboard
-                    image_response = switchboard_service.edit_media(
+                    # Create media with Switchboard
+                    media_response = switchboard_service.edit_media(
                         client_id=client_id,
                         template_data=template_payload,
                         platform=platform,
                         post_type=content_type,
                     )
 
-                    if image_response and "sizes" in image_response:
-                        context.platform_images[platform] = image_response["sizes"][0][
+                    if media_response and "sizes" in media_response:
+                        context.platform_images[platform] = media_response["sizes"][0][
                             "url"
                         ]
-                        self.logger.info(f"Successfully generated image for {platform}")
-                    else:
-                        self.logger.warning(f"No image URL returned for {platform}")
-                        context.platform_images[platform] = context.selected_image
-
-                except ValueError as ve:
-                    self.logger.error(f"Template validation error for {platform}: {ve}")
-                    await self.send_message(
-                        client_id, f"Error with template data for {platform}: {ve}"
-                    )
-                    context.platform_images[platform] = context.selected_image
-                except Exception as e:
-                    self.logger.error(
-                        f"Error generating image for {platform}: {str(e)}"
-                    )
-                    context.platform_images[platform] = context.selected_image
-
-            # Update context with generated images
-            self.state_manager.update_context(client_id, context.model_dump())
-
-            await self.send_message(
-                client_id, "Here are the edited images for each platform:"
-            )
-            for platform, image_url in context.platform_images.items():
-                await self.client.send_media(
-                    media_items=[{"type": "image", "url": image_url}],
-                    phone_number=client_id,
-                )
-
-            # Post to platforms with the images
-            await self.post_to_platforms(client_id)
-
-        except Exception as e:
-            self.logger.error(f"Error in image generation: {str(e)}")
-            await self.send_message(
-                client_id, f"An error occurred during image generation: {str(e)}"
-            )
-            # Try to continue with posting anyway
-            await self.post_to_platforms(client_id)
-
-    async def generate_platform_videos(self, client_id: str) -> None:
-        """Generate videos for each platform"""
-        self.logger.info(f"Starting generate_platform_videos for {client_id}")
-        context = WorkflowContext(**self.state_manager.get_context(client_id))
-
-        # Generate platform-specific videos using Switchboard Canvas
-        await self.send_message(client_id, "Editing videos for each platform...")
-
-        try:
-            for platform in context.selected_platforms:
-                # Get the content type for this platform
-                content_type = context.content_types.get(
-                    platform, context.selected_content_type
-                )
-                self.logger.info(
-                    f"Generating video for {platform} with content type {content_type}"
-                )
-
-                try:
-                    # Use the template service to prepare template data
-                    template_data = template_service.prepare_template_data(
-                        platform=platform, content_type=content_type, context=context
-                    )
-
-                    # Log the prepared template data
-                    self.logger.info(
-                        f"Prepared template data for {platform}_{content_type} video: {template_data}"
-                    )
-
-                    # Validate inputs for this template using the template service
-                    is_valid, error_message, validated_data = (
-                        template_service.validate_template_data(
-                            platform=platform,
-                            content_type=content_type,
-                            template_data=template_data,
-                        )
-                    )
-
-                    # For backward compatibility, also get the template ID
-                    template_id = template_service.get_template_id(
-                        platform, content_type
-                    )
-
-                    if not is_valid:
-                        self.logger.warning(f"Invalid template data: {error_message}")
-                        await self.send_message(
-                            client_id,
-                            f"Could not generate content for {platform}: {error_message}",
+                        self.logger.info(
+                            f"Successfully generated {media_type} for {platform}"
                         )
-                        continue
-
-                    # Build final template payload
-                    template_payload = template_service.build_payload(
-                        template_id, validated_data
-                    )
-
-                    # Create video with Switchboard
-                    video_response = switchboard_service.edit_media(
-                        client_id=client_id,
-                        template_data=template_payload,
-                        platform=platform,
-                        post_type=content_type,
-                    )
-
-                    if video_response and "sizes" in video_response:
-                        context.platform_images[platform] = video_response["sizes"][0][
-                            "url"
-                        ]
-                        self.logger.info(f"Successfully generated video for {platform}")
                     else:
-                        self.logger.warning(f"No video URL returned for {platform}")
-                        context.platform_images[platform] = context.selected_video
+                        self.logger.warning(
+                            f"No {media_type} URL returned for {platform}"
+                        )
+                        context.platform_images[platform] = fallback
 
                 except ValueError as ve:
                     self.logger.error(f"Template validation error for {platform}: {ve}")
                     await self.send_message(
                         client_id, f"Error with template data for {platform}: {ve}"
                     )
-                    if context.selected_video:
-                        context.platform_images[platform] = context.selected_video
+                    if fallback or not is_video:
+                        context.platform_images[platform] = fallback
                 except Exception as e:
                     self.logger.error(
-                        f"Error generating video for {platform}: {str(e)}"
+                        f"Error generating {media_type} for {platform}: {str(e)}"
                     )
-                    if context.selected_video:
-                        context.platform_images[platform] = context.selected_video
+                    if fallback or not is_video:
+                        context.platform_images[platform] = fallback
 
-            # Update context with generated videos
+            # Update context with generated media
             self.state_manager.update_context(client_id, context.model_dump())
 
             await self.send_message(
-                client_id, "Here are the edited videos for each platform:"
+                client_id, f"Here are the edited {media_type}s for each platform:"
+            )
+            # One call for all platforms: send_media dispatches the items
+            # concurrently instead of paying a round trip per platform
+            await self.client.send_media(
+                media_items=[
+                    {"type": media_type, "url": media_url}
+                    for media_url in context.platform_images.values()
+                ],
+                phone_number=client_id,
             )
-            for platform, video_url in context.platform_images.items():
-                await self.client.send_media(
-                    media_items=[{"type": "video", "url": video_url}],
-                    phone_number=client_id,
-                )
 
-            # Post to platforms with the videos
+            # Post to platforms with the media
             await self.post_to_platforms(client_id)
 
         except Exception as e:
-            self.logger.error(f"Error in video generation: {str(e)}")
+            self.logger.error(f"Error in {media_type} generation: {str(e)}")
             await self.send_message(
-                client_id, f"An error occurred during video generation: {str(e)}"
+                client_id, f"An error occurred during {media_type} generation: {str(e)}"
             )
             # Try to continue with posting anyway
             await self.post_to_platforms(client_id)
@@ -416,7 +349,7 @@ class ExecutionHandler(BaseHandler):
         self.state_manager.set_state(client_id, WorkflowState.POST_EXECUTION)
 
         # Determine if this is a video-based content
-        is_video_content = getattr(context, "is_video_content", False)
+        is_video_content = context.is_video_content
         media_type = "video" if is_video_content else "image"
 
         self.logger.info(f"Posting for {client_id} with {media_type} content type")
@@ -509,7 +442,7 @@ class ExecutionHandler(BaseHandler):
         )
 
         # Determine if this is video content
-        is_video_content = getattr(context, "is_video_content", False)
+        is_video_content = context.is_video_content
 
         # Send the selected media with the summary
         if is_video_content and context.selected_video:
@@ -533,14 +466,9 @@ class ExecutionHandler(BaseHandler):
         await asyncio.sleep(1)
 
         # Send confirmation buttons
-        buttons = [
-            {"id": "yes", "title": "Yes, Continue"},
-            {"id": "no", "title": "No, Start Over"},
-        ]
-
         await self.client.send_interactive_buttons(
             header_text="Confirmation",
             body_text=MESSAGES["editing_confirmation"],
-            buttons=buttons,
+            buttons=_CONFIRMATION_BUTTONS,
             phone_number=client_id,
         )
@@ -75,7 +75,7 @@ class SchedulingHandler(BaseHandler):
             caption=context.caption,
         )
 
-        include_images = getattr(context, "include_images", True)
+        include_images = context.include_images
         if include_images and context.selected_image:
             await self.client.send_media(
                 media_items=[
@@ -0,0 +1,35 @@
+import asyncio
+
+import httpx
+
+from app.services.messaging import media_utils
+
+
+def test_concurrent_url_lookups_never_overlap(monkeypatch):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get(url):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        # Failed lookups are not cached, so every waiter makes its own request
+        return httpx.Response(500, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(media_utils.GRAPH_CLIENT, "get", get)
+
+    async def run():
+        first = asyncio.create_task(media_utils._retrieve_media_url("m1"))
+        second = asyncio.create_task(media_utils._retrieve_media_url("m1"))
+        await first
+        # Arrives after the first lookup released the lock but before the
+        # woken second lookup has taken it
+        third = asyncio.create_task(media_utils._retrieve_media_url("m1"))
+        await asyncio.gather(second, third)
+
+    asyncio.run(run())
+
+    assert max_in_flight == 1
+    assert media_utils._media_url_locks == {}
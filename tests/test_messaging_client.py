@@ -0,0 +1,73 @@
+import asyncio
+from tempfile import SpooledTemporaryFile
+
+import httpx
+
+from app.services.messaging import client
+from app.services.messaging.client import WhatsApp
+from app.services.types import MediaItem
+
+
+def _whatsapp(sent):
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, json={"messages": [{"id": "wamid.test"}]})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return WhatsApp("token", "phone-number-id", client=http_client)
+
+
+def test_send_media_reports_missing_url_per_item():
+    sent = []
+    whatsapp = _whatsapp(sent)
+    items = [
+        MediaItem(type="image", url=None),
+        MediaItem(type="image", url="https://example.com/a.jpg"),
+    ]
+
+    results = asyncio.run(whatsapp.send_media(items, "15550001111"))
+
+    assert "error" in results[0]
+    assert "error" not in results[1]
+    assert len(sent) == 1
+
+
+def test_upload_video_streams_spooled_file():
+    sent = []
+    whatsapp = _whatsapp(sent)
+    video = SpooledTemporaryFile(max_size=1 << 20)
+    video.write(b"\x00video" * 1000)
+    video.seek(0)
+
+    asyncio.run(whatsapp._upload_video_to_whatsapp(video, "clip.mp4"))
+
+    body = sent[0].read()
+    assert b"\x00video" * 1000 in body
+    # Sizing the upload must not force the in-memory spool onto disk
+    assert not video._rolled
+
+
+def test_media_id_cache_is_bounded(monkeypatch):
+    whatsapp = _whatsapp([])
+    uploads = []
+
+    async def download(url):
+        return SpooledTemporaryFile()
+
+    async def upload(video_file, filename):
+        uploads.append(filename)
+        return f"media-{len(uploads)}"
+
+    monkeypatch.setattr(client, "MEDIA_ID_CACHE_SIZE", 2)
+    monkeypatch.setattr(whatsapp, "_download_video", download)
+    monkeypatch.setattr(whatsapp, "_upload_video_to_whatsapp", upload)
+
+    async def run():
+        for url in ("https://a", "https://b", "https://a", "https://c"):
+            await whatsapp._handle_video_url(url, url[-1])
+
+    asyncio.run(run())
+
+    # "a" was reused, then "b" was evicted as the least recently used
+    assert uploads == ["a", "b", "c"]
+    assert list(whatsapp._media_id_cache) == ["https://a", "https://c"]
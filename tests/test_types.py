@@ -0,0 +1,18 @@
+from app.services.types import ButtonItem, MediaItem, SectionItem
+
+
+def test_media_item_from_dict_treats_none_as_empty():
+    item = MediaItem.from_dict({"type": "image", "url": None, "caption": None})
+
+    assert item.url == ""
+    assert item.caption == ""
+    assert item.media_id == ""
+
+
+def test_section_item_from_dict_treats_none_as_empty():
+    section = SectionItem.from_dict(
+        {"title": None, "items": [{"id": "a", "title": "A", "description": None}]}
+    )
+
+    assert section.title == ""
+    assert section.items == [ButtonItem(id="a", title="A")]